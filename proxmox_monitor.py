@@ -1,26 +1,100 @@
 #!/usr/bin/env python3
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache
 import json
 import logging
+import os
+import pickle
+import re
+import sys
+import threading
+import time
+from typing import NamedTuple
+try:
+    # Rust-based encoder, typically 5-10x faster than stdlib json
+    import orjson
+except ImportError:
+    orjson = None
 import proxmoxer
-from prettytable import PrettyTable
+from requests.adapters import HTTPAdapter
 from tenacity import retry, stop_after_attempt, wait_exponential
 import yaml
+try:
+    # LibYAML C binding, typically ~10x faster than the pure-Python loader
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
 import argparse
 from colorama import init, Fore, Back, Style
 
-# Initialize colorama for cross-platform color support
-init(autoreset=True)
+# When output is piped (tee, grep, log collectors) ANSI codes and table
+# alignment are wasted work; detect the TTY once at startup
+IS_TTY = sys.stdout.isatty()
+
+# Initialize colorama for cross-platform color support; strip color codes
+# from piped output
+init(autoreset=True, strip=not IS_TTY)
+
+# Disk config keys look like scsi0, virtio1, ide2, sata0; their values carry
+# a size=<N><unit> field among comma-separated options
+DISK_KEY_RE = re.compile(r'(?:scsi|virtio|ide|sata)\d+$')
+DISK_SIZE_RE = re.compile(r'(?:^|,)size=([^,]+)')
+
+# ANSI escape sequences must be ignored when measuring cell widths
+ANSI_RE = re.compile(r'\x1b\[[0-9;]*m')
+
+# Free-resource colors indexed by threshold count: 0 = under 10% free (red),
+# 1 = under 30% (yellow), 2 = healthy (green)
+THRESHOLD_COLORS = (Fore.RED, Fore.YELLOW, Fore.GREEN)
+
+# Render an aligned text table; cells may contain ANSI color codes.
+# One pass computes column widths, one pass renders - much cheaper than
+# PrettyTable's per-cell formatting machinery on large clusters.
+def render_table(headers, rows):
+    str_rows = [[str(cell) for cell in row] for row in rows]
+
+    # Piped output gets plain tab-separated rows: no width computation, no
+    # padding, and friendlier to downstream tools like cut/awk
+    if not IS_TTY:
+        return '\n'.join(
+            '\t'.join(ANSI_RE.sub('', cell) for cell in row)
+            for row in [list(headers)] + str_rows
+        )
+
+    widths = [
+        max(len(ANSI_RE.sub('', cell)) for cell in column)
+        for column in zip(headers, *str_rows)
+    ]
+
+    def render_row(row):
+        return ' | '.join(
+            cell + ' ' * (width - len(ANSI_RE.sub('', cell)))
+            for cell, width in zip(row, widths)
+        )
+
+    separator = '-+-'.join('-' * width for width in widths)
+    lines = [render_row(headers), separator]
+    lines.extend(render_row(row) for row in str_rows)
+    return '\n'.join(lines)
+
+# Per-VM allocation record; a plain tuple with named fields is far lighter
+# than a 7-key dict when clusters carry thousands of VMs
+class VMRecord(NamedTuple):
+    server: str
+    node: str
+    vm_name: str
+    status: str
+    cpu_assigned: float
+    mem_assigned: float
+    disk_assigned: float
 
 def safe_numeric(value, default=0):
     """Safely convert a value to a numeric type for division operations."""
     if value is None:
         return default
     try:
-        if isinstance(value, str):
-            # Try to convert string to float or int
-            return float(value)
-        return float(value)  # Handle other numeric types
+        return float(value)
     except (ValueError, TypeError):
         return default
 
@@ -49,194 +123,325 @@ console_handler = logging.StreamHandler()
 console_handler.setFormatter(ColoredFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
 logger.addHandler(console_handler)
 
+CACHE_DIR = os.path.expanduser('~/.cache/proxmox_monitor')
+
+# Cache location for parsed credentials (skips re-parsing unchanged YAML)
+CREDS_CACHE_FILE = os.path.join(CACHE_DIR, 'creds.pkl')
+
+# Disk-backed TTL cache for node capacity (CPU count, total memory and disk),
+# which only changes on hardware or storage reconfiguration. Repeated runs
+# (cron, watch loops) then skip the node status and storage round-trips.
+NODE_CACHE_FILE = os.path.join(CACHE_DIR, 'node_capacity.pkl')
+node_cache_ttl = 3600  # seconds; 0 disables the cache (see --no-cache)
+_node_cache_lock = threading.Lock()
+
+def load_node_capacity(server, node_name):
+    if node_cache_ttl <= 0:
+        return None
+    try:
+        with _node_cache_lock:
+            with open(NODE_CACHE_FILE, 'rb') as f:
+                cache = pickle.load(f)
+        entry = cache.get((server, node_name))
+        if entry and time.time() - entry['time'] < node_cache_ttl:
+            return entry['capacity']
+    except (OSError, pickle.PickleError, EOFError):
+        pass
+    return None
+
+def store_node_capacity(server, node_name, capacity):
+    if node_cache_ttl <= 0:
+        return
+    with _node_cache_lock:
+        try:
+            with open(NODE_CACHE_FILE, 'rb') as f:
+                cache = pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError):
+            cache = {}
+        cache[(server, node_name)] = {'time': time.time(), 'capacity': capacity}
+        try:
+            os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+            with open(NODE_CACHE_FILE, 'wb') as f:
+                pickle.dump(cache, f)
+        except OSError as e:
+            logger.debug("Could not write node capacity cache: %s", e)
+
 # Function to load credentials from YAML
 def load_credentials(yaml_file):
     try:
-        with open(yaml_file, 'r') as file:
-            data = yaml.safe_load(file)
-        return data.get('servers', {})
+        stat = os.stat(yaml_file)
     except FileNotFoundError:
-        logger.error(f"Error: {yaml_file} not found.")
+        logger.error("Error: %s not found.", yaml_file)
+        return {}
+
+    # Reuse the cached parse when the YAML file hasn't changed on disk
+    cache_key = f"{yaml_file}:{stat.st_mtime_ns}:{stat.st_size}"
+    try:
+        with open(CREDS_CACHE_FILE, 'rb') as f:
+            cached = pickle.load(f)
+        if cached.get('key') == cache_key:
+            return cached['servers']
+    except (OSError, pickle.PickleError, EOFError, KeyError):
+        pass
+
+    try:
+        # Bytes input lets CSafeLoader skip an extra decode step
+        with open(yaml_file, 'rb') as file:
+            data = yaml.load(file, Loader=YamlLoader)
+        servers = data.get('servers', {})
+    except FileNotFoundError:
+        logger.error("Error: %s not found.", yaml_file)
         return {}
     except yaml.YAMLError as e:
-        logger.error(f"Error parsing YAML: {e}")
+        logger.error("Error parsing YAML: %s", e)
         return {}
 
-# Function to convert disk size to GB
+    try:
+        os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+        # The cache holds plaintext credentials - keep it owner-only
+        fd = os.open(CREDS_CACHE_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump({'key': cache_key, 'servers': servers}, f)
+    except OSError as e:
+        logger.debug("Could not write credentials cache: %s", e)
+
+    return servers
+
+# Suffix multipliers to GB; bare values are assumed to be bytes
+DISK_SIZE_MULTIPLIERS = {
+    'G': 1.0,
+    'M': 1 / 1024,
+    'K': 1 / (1024 ** 3),
+    'T': 1024.0,
+}
+
+# Function to convert disk size to GB. Proxmox size strings like "32G"
+# repeat heavily across VMs, so memoization makes repeats near-free.
+@lru_cache(maxsize=4096)
 def parse_disk_size(size_str):
     size_str = str(size_str).strip()  # Ensure string type
-    if size_str.endswith('G'):
-        return float(size_str.replace('G', ''))
-    elif size_str.endswith('M'):
-        return float(size_str.replace('M', '')) / 1024
-    elif size_str.endswith('K'):
-        return float(size_str.replace('K', '')) / (1024 ** 3)
-    elif size_str.endswith('T'):
-        return float(size_str.replace('T', '')) * 1024
-    else:
-        try:
-            return float(size_str) / (1024 ** 3)  # Assume bytes
-        except ValueError:
-            return 0
+    multiplier = DISK_SIZE_MULTIPLIERS.get(size_str[-1:])
+    try:
+        if multiplier is not None:
+            return float(size_str[:-1]) * multiplier
+        return float(size_str) / (1024 ** 3)  # Assume bytes
+    except ValueError:
+        return 0
 
 # Function to display the list of VMs on a server
 def display_vm_list(server, nodes):
-    logger.info(f"Displaying VMs on server {server}")
+    logger.info("Displaying VMs on server %s", server)
     print(f"\n{Fore.CYAN}{Style.BRIGHT}--- VMs on server {server} ---{Style.RESET_ALL}")
     for node_name, node_data in nodes.items():
         if 'vm_details' in node_data and node_data['vm_details']:
-            table = PrettyTable()
-            table.field_names = ["VM Name", "Status", "CPU", "RAM (GB)", "Disk (GB)"]
-            
+            rows = []
             for vm in node_data['vm_details']:
-                status_color = Fore.GREEN if vm['status'] == 'running' else Fore.RED
-                row = [
-                    vm['vm_name'],
-                    f"{status_color}{vm['status']}{Style.RESET_ALL}",
-                    vm['cpu_assigned'],
-                    f"{vm['mem_assigned']:.2f}",
-                    f"{vm['disk_assigned']:.2f}"
-                ]
-                table.add_row(row)
-            
+                status_color = Fore.GREEN if vm.status == 'running' else Fore.RED
+                rows.append([
+                    vm.vm_name,
+                    f"{status_color}{vm.status}{Style.RESET_ALL}",
+                    vm.cpu_assigned,
+                    f"{vm.mem_assigned:.2f}",
+                    f"{vm.disk_assigned:.2f}"
+                ])
+
             print(f"\n{Fore.YELLOW}{Style.BRIGHT}Node: {node_name}{Style.RESET_ALL}")
-            print(table)
+            print(render_table(["VM Name", "Status", "CPU", "RAM (GB)", "Disk (GB)"], rows))
         else:
             print(f"\n{Fore.YELLOW}{Style.BRIGHT}Node: {node_name}{Style.RESET_ALL} - {Fore.RED}No VMs found{Style.RESET_ALL}")
 
+# Enable HTTP keep-alive on the proxmoxer backend so the many small JSON GETs
+# reuse pooled TLS connections instead of paying a handshake per request
+def enable_connection_pooling(proxmox):
+    try:
+        session = proxmox._store['session']
+        session.mount('https://', HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=0))
+    except (AttributeError, KeyError) as e:
+        # proxmoxer internals changed; keep-alive just won't be pooled
+        logger.debug("Could not enable connection pooling: %s", e)
+
 # Function to get server statistics with retry mechanism
 @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=30))
-def get_server_stats(server, username, password):
+def get_server_stats(server, username, password, include_details=False):
     try:
-        logger.info(f"Connecting to {server}...")
+        logger.info("Connecting to %s...", server)
         proxmox = proxmoxer.ProxmoxAPI(server, user=username, password=password, verify_ssl=False, timeout=15)
-        nodes = proxmox.nodes.get()
+        enable_connection_pooling(proxmox)
         node_data = {}
-        
-        # Create a server_hostname → node_name mapping
-        server_hostname = server.split('.')[0]  # Extract hostname from FQDN
-        logger.debug(f"Using hostname: {server_hostname} for server {server}")
-        
-        # Only process nodes that belong to this server
-        for node in nodes:
-            node_name = node['node']
-            
-            if node_name == server_hostname:
-                logger.debug(f"Processing node {node_name}")
-                node_stats = proxmox.nodes(node_name).status.get()
-                vms = proxmox.nodes(node_name).qemu.get()
-                
-                # CPU and memory calculation
-                total_cpu_max = safe_numeric(node_stats.get('cpuinfo', {}).get('cpus', 0))
-                memory_total = safe_numeric(node_stats.get('memory', {}).get('total', 0))
-                total_mem_max = memory_total / (1024**3)
-                
-                # Get all storage pools for this node
-                storages = proxmox.nodes(node_name).storage.get()
-                total_disk_max = 0
-                for storage in storages:
-                    # Skip storage types that don't represent local disk space
-                    if storage.get('type') in ('dir', 'lvm', 'lvmthin', 'zfspool'):
-                        # Get storage status to find total/used space
-                        try:
-                            storage_status = proxmox.nodes(node_name).storage(storage['storage']).status.get()
-                            storage_total = safe_numeric(storage_status.get('total', 0))
-                            total_disk_max += storage_total / (1024**3)
-                        except Exception as e:
-                            # Some storage types might not support status reporting
-                            logger.warning(f"Could not get storage status for {storage['storage']}: {e}")
-                # Rest of the VM processing
-                total_cpu_used = 0
-                total_mem_used = 0
-                total_disk_used = 0
-                vm_details = []
-                
-                for vm in vms:
-                    vm_id = vm['vmid']
-                    vm_name = vm['name']
-                    status = vm['status']
-                    
-                    vm_config = proxmox.nodes(node_name).qemu(vm_id).config.get()
+
+        # The node name is assumed to match the server's hostname; query it
+        # directly instead of listing and scanning every node in the cluster
+        node_name = server.split('.')[0]  # Extract hostname from FQDN
+        logger.debug("Using hostname: %s for server %s", node_name, server)
+
+        # Node capacity rarely changes; a cache hit skips the node status and
+        # storage round-trips entirely
+        capacity = load_node_capacity(server, node_name)
+
+        # Batch-submit the independent top-level queries and reap them
+        # together - over the pooled keep-alive connections they overlap
+        # instead of stacking sequential round-trips
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            resources_future = executor.submit(proxmox.cluster.resources.get, type='vm')
+            qemu_future = executor.submit(proxmox.nodes(node_name).qemu.get)
+            if capacity is None:
+                status_future = executor.submit(proxmox.nodes(node_name).status.get)
+                storage_future = executor.submit(proxmox.nodes(node_name).storage.get)
+
+            # One bulk query returns maxcpu/maxmem/maxdisk for every VM in the
+            # cluster, replacing one config.get() round-trip per VM
+            try:
+                vm_resources = {r['vmid']: r for r in resources_future.result()}
+            except Exception as e:
+                logger.warning("Could not get cluster resources from %s: %s", server, e)
+                vm_resources = {}
+
+            if capacity is None:
+                try:
+                    node_stats = status_future.result()
+                except Exception as e:
+                    logger.error("Node %s is not registered on %s: %s", node_name, server, e)
+                    raise
+                storages = storage_future.result()
+
+            vms = qemu_future.result()
+
+        if capacity is not None:
+            total_cpu_max, total_mem_max, total_disk_max = capacity
+        else:
+            # CPU and memory calculation
+            total_cpu_max = safe_numeric(node_stats.get('cpuinfo', {}).get('cpus', 0))
+            memory_total = safe_numeric(node_stats.get('memory', {}).get('total', 0))
+            total_mem_max = memory_total / (1024**3)
+
+            # Keep only storage pools that represent local disk space
+            local_storages = [s for s in storages if s.get('type') in ('dir', 'lvm', 'lvmthin', 'zfspool')]
+
+        def fetch_storage_status(storage):
+            # Get storage status to find total/used space
+            try:
+                return proxmox.nodes(node_name).storage(storage['storage']).status.get()
+            except Exception as e:
+                # Some storage types might not support status reporting
+                logger.warning("Could not get storage status for %s: %s", storage['storage'], e)
+                return None
+
+        def fetch_vm_config(vm):
+            try:
+                return proxmox.nodes(node_name).qemu(vm['vmid']).config.get()
+            except Exception as e:
+                logger.warning("Could not get config for VM %s: %s", vm['name'], e)
+                return None
+
+        if capacity is None:
+            # Fan out the per-storage API calls - each one is a blocking
+            # HTTPS round-trip, so running them concurrently cuts
+            # collection time from N round-trips to roughly one
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                storage_statuses = list(executor.map(fetch_storage_status, local_storages))
+
+            total_disk_max = 0
+            for storage_status in storage_statuses:
+                if storage_status is not None:
+                    storage_total = safe_numeric(storage_status.get('total', 0))
+                    total_disk_max += storage_total / (1024**3)
+
+            store_node_capacity(server, node_name, (total_cpu_max, total_mem_max, total_disk_max))
+        # Rest of the VM processing
+        total_cpu_used = 0
+        total_mem_used = 0
+        total_disk_used = 0
+        vm_details = []
+
+        for vm in vms:
+            vm_name = vm['name']
+            status = vm['status']
+
+            # Stopped VMs don't contribute to the usage totals, so their
+            # details (and any fallback config fetch) are only needed when
+            # the VM list will actually be displayed
+            if status != 'running' and not include_details:
+                continue
+
+            resource = vm_resources.get(vm['vmid'], {})
+            vm_cpu = safe_numeric(resource.get('maxcpu', 1))
+            vm_mem = safe_numeric(resource.get('maxmem', 0)) / (1024**3)
+            vm_disk = safe_numeric(resource.get('maxdisk', 0)) / (1024**3)
+
+            if vm_disk == 0 or not resource:
+                # Fall back to the per-VM config when the bulk query
+                # didn't report disk size (e.g. disks on storage types
+                # without maxdisk support)
+                vm_config = fetch_vm_config(vm)
+                if vm_config is None:
+                    continue
+                if not resource:
                     vm_cpu = safe_numeric(vm_config.get('cores', 1))
-                    vm_memory = safe_numeric(vm_config.get('memory', 0))
-                    vm_mem = vm_memory / 1024
-                    vm_disk = 0
-                    # Search for all disk types with any index number
-                    disk_prefixes = ['scsi', 'virtio', 'ide', 'sata']
-                    for key in vm_config:
-                        # Check if the key starts with any disk prefixes
-                        # and the rest is a number (e.g.: scsi0, scsi1, virtio0, etc.)
-                        is_disk = False
-                        for prefix in disk_prefixes:
-                            if key.startswith(prefix) and key[len(prefix):].isdigit():
-                                is_disk = True
-                                break
-                        
-                        if is_disk and vm_config[key]:
-                            disk_str = vm_config[key]
-                            size_part = [part for part in disk_str.split(',') if 'size=' in part]
-                            if size_part:
-                                size_str = size_part[0].split('=')[1]
-                                # Accumulate size instead of replacing it
-                                vm_disk += parse_disk_size(size_str)
-                    vm_details.append({
-                        'server': server,
-                        'node': node_name,
-                        'vm_name': vm_name,
-                        'status': status,
-                        'cpu_assigned': vm_cpu,
-                        'mem_assigned': vm_mem,
-                        'disk_assigned': vm_disk
-                    })
-                    
-                    if status == 'running':
-                        total_cpu_used += vm_cpu
-                        total_mem_used += vm_mem
-                        total_disk_used += vm_disk
-                
-                node_data[node_name] = {
-                    'vms_running': sum(1 for vm in vms if vm['status'] == 'running'),
-                    'vms_stopped': sum(1 for vm in vms if vm['status'] != 'running'),
-                    'cpu_used': total_cpu_used,
-                    'cpu_free': total_cpu_max - total_cpu_used,
-                    'cpu_max': total_cpu_max,
-                    'mem_used': total_mem_used,
-                    'mem_free': total_mem_max - total_mem_used,
-                    'mem_max': total_mem_max,
-                    'disk_used': total_disk_used,
-                    'disk_free': total_disk_max - total_disk_used,
-                    'disk_max': total_disk_max,
-                    'vm_details': vm_details
-                }
-        
-        return node_data
+                    vm_mem = safe_numeric(vm_config.get('memory', 0)) / 1024
+                vm_disk = 0
+                # Search for all disk keys (scsi0, virtio1, etc.) and
+                # accumulate their size= fields
+                for key, value in vm_config.items():
+                    if DISK_KEY_RE.match(key) and value:
+                        match = DISK_SIZE_RE.search(value)
+                        if match:
+                            # Accumulate size instead of replacing it
+                            vm_disk += parse_disk_size(match.group(1))
+            vm_details.append(VMRecord(
+                server=server,
+                node=node_name,
+                vm_name=vm_name,
+                status=status,
+                cpu_assigned=vm_cpu,
+                mem_assigned=vm_mem,
+                disk_assigned=vm_disk
+            ))
+
+            if status == 'running':
+                total_cpu_used += vm_cpu
+                total_mem_used += vm_mem
+                total_disk_used += vm_disk
+
+        node_data[node_name] = {
+            'vms_running': sum(1 for vm in vms if vm['status'] == 'running'),
+            'vms_stopped': sum(1 for vm in vms if vm['status'] != 'running'),
+            'cpu_used': total_cpu_used,
+            'cpu_free': total_cpu_max - total_cpu_used,
+            'cpu_max': total_cpu_max,
+            'mem_used': total_mem_used,
+            'mem_free': total_mem_max - total_mem_used,
+            'mem_max': total_mem_max,
+            'disk_used': total_disk_used,
+            'disk_free': total_disk_max - total_disk_used,
+            'disk_max': total_disk_max,
+            'vm_details': vm_details
+        }
+
+        # Emit per-server running totals alongside node_data so callers can
+        # accumulate cluster totals without re-walking the structure
+        server_totals = (
+            sum(stats['vms_running'] for stats in node_data.values()),
+            sum(stats['cpu_used'] for stats in node_data.values()),
+            sum(stats['cpu_free'] for stats in node_data.values()),
+            sum(stats['mem_used'] for stats in node_data.values()),
+            sum(stats['mem_free'] for stats in node_data.values()),
+            sum(stats['disk_used'] for stats in node_data.values()),
+            sum(stats['disk_free'] for stats in node_data.values()),
+        )
+        return node_data, server_totals
     except Exception as e:
-        logger.error(f"Error connecting to {server}: {str(e)}")
+        logger.error("Error connecting to %s: %s", server, e)
         # Add more detailed logging in debug mode
-        logger.debug(f"Detailed error information:", exc_info=True)
+        logger.debug("Detailed error information:", exc_info=True)
         raise
 
-# Function to predict growth
-def predict_growth(server_data):
+# Function to predict growth from cluster totals
+# (vms_running, cpu_used, cpu_free, mem_used, mem_free, disk_used, disk_free)
+def predict_growth(cluster_totals):
     logger.info("Calculating growth prediction")
-    total_vms_running = 0
-    total_cpu_used = 0
-    total_cpu_free = 0
-    total_mem_used = 0
-    total_mem_free = 0
-    total_disk_used = 0
-    total_disk_free = 0
-    
-    for nodes in server_data.values():
-        for stats in nodes.values():
-            total_vms_running += stats['vms_running']
-            total_cpu_used += stats['cpu_used']
-            total_cpu_free += stats['cpu_free']
-            total_mem_used += stats['mem_used']
-            total_mem_free += stats['mem_free']
-            total_disk_used += stats['disk_used']
-            total_disk_free += stats['disk_free']
-    
+    (total_vms_running, total_cpu_used, total_cpu_free, total_mem_used,
+     total_mem_free, total_disk_used, total_disk_free) = cluster_totals
+
     if total_vms_running == 0:
         logger.warning("No running VMs found, cannot predict growth")
         return 0
@@ -253,28 +458,29 @@ def predict_growth(server_data):
     
     # Return the minimum growth potential as an integer (minimum resources constraint)
     prediction = max(0, int(min(cpu_based_growth, mem_based_growth, disk_based_growth)))
-    logger.info(f"Predicted potential additional VMs: {prediction}")
+    logger.info("Predicted potential additional VMs: %s", prediction)
     return prediction
 
 # Function to create dashboard and graphs
 def create_dashboard(server_data, growth_prediction):
     logger.info("Creating dashboard")
-    table = PrettyTable()
-    table.field_names = ["Server", "Node", "VMs Running", "VMs Stopped", "CPU Used", "CPU Free", 
-                         "Mem Used (GB)", "Mem Free (GB)", "Disk Used (GB)", "Disk Free (GB)"]
-    
+    headers = ["Server", "Node", "VMs Running", "VMs Stopped", "CPU Used", "CPU Free",
+               "Mem Used (GB)", "Mem Free (GB)", "Disk Used (GB)", "Disk Free (GB)"]
+    rows = []
+
     total_running = 0
     total_stopped = 0
     for server, nodes in server_data.items():
         for node, stats in nodes.items():
-            # Color free resources indicators based on thresholds
-            cpu_free_color = Fore.GREEN if stats['cpu_free'] > stats['cpu_max'] * 0.3 else (Fore.YELLOW if stats['cpu_free'] > stats['cpu_max'] * 0.1 else Fore.RED)
-            mem_free_color = Fore.GREEN if stats['mem_free'] > stats['mem_max'] * 0.3 else (Fore.YELLOW if stats['mem_free'] > stats['mem_max'] * 0.1 else Fore.RED)
-            disk_free_color = Fore.GREEN if stats['disk_free'] > stats['disk_max'] * 0.3 else (Fore.YELLOW if stats['disk_free'] > stats['disk_max'] * 0.1 else Fore.RED)
+            # Color free resources indicators based on thresholds: each passed
+            # threshold bumps the index one step toward green
+            cpu_free_color = THRESHOLD_COLORS[(stats['cpu_free'] > stats['cpu_max'] * 0.1) + (stats['cpu_free'] > stats['cpu_max'] * 0.3)]
+            mem_free_color = THRESHOLD_COLORS[(stats['mem_free'] > stats['mem_max'] * 0.1) + (stats['mem_free'] > stats['mem_max'] * 0.3)]
+            disk_free_color = THRESHOLD_COLORS[(stats['disk_free'] > stats['disk_max'] * 0.1) + (stats['disk_free'] > stats['disk_max'] * 0.3)]
             
             # Color for VMs stopped - green if 0, red if > 0
             stopped_color = Fore.GREEN if stats['vms_stopped'] == 0 else Fore.RED
-            table.add_row([
+            rows.append([
                 server, 
                 node, 
                 stats['vms_running'],  # No color for VMs running
@@ -287,27 +493,30 @@ def create_dashboard(server_data, growth_prediction):
                 f"{disk_free_color}{stats['disk_free']:.2f}{Style.RESET_ALL}"
             ])
             total_running += stats['vms_running']
-            total_stopped += stats['vms_stopped']    
+            total_stopped += stats['vms_stopped']
     print(f"\n{Fore.CYAN}{Style.BRIGHT}Proxmox Cluster Dashboard - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}{Style.RESET_ALL}")
-    print(table)
+    print(render_table(headers, rows))
     # Determine color for total VMs stopped
     total_stopped_color = Fore.GREEN if total_stopped == 0 else Fore.RED
-    
-    print(f"\n{Fore.CYAN}{Style.BRIGHT}Proxmox Cluster Dashboard - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}{Style.RESET_ALL}")
-    print(table)
     print(f"\n{Fore.BLUE}Total VMs Running: {total_running}, Total VMs Stopped: {total_stopped_color}{total_stopped}{Style.RESET_ALL}")
     
     # Display growth prediction with color
     prediction_color = Fore.GREEN if growth_prediction > 10 else (Fore.YELLOW if growth_prediction > 3 else Fore.RED)
     print(f"{Fore.BLUE}Predicted additional VMs the cluster can support: {prediction_color}{growth_prediction}{Style.RESET_ALL}")
     
-    # Display resource utilization averages
-    total_cpu_max = sum(stats['cpu_max'] for nodes in server_data.values() for stats in nodes.values())
-    total_cpu_used = sum(stats['cpu_used'] for nodes in server_data.values() for stats in nodes.values())
-    total_mem_max = sum(stats['mem_max'] for nodes in server_data.values() for stats in nodes.values())
-    total_mem_used = sum(stats['mem_used'] for nodes in server_data.values() for stats in nodes.values())
-    total_disk_max = sum(stats['disk_max'] for nodes in server_data.values() for stats in nodes.values())
-    total_disk_used = sum(stats['disk_used'] for nodes in server_data.values() for stats in nodes.values())
+    # Display resource utilization averages (single pass over server_data
+    # instead of one traversal per total)
+    total_cpu_max = total_cpu_used = 0
+    total_mem_max = total_mem_used = 0.0
+    total_disk_max = total_disk_used = 0.0
+    for nodes in server_data.values():
+        for stats in nodes.values():
+            total_cpu_max += stats['cpu_max']
+            total_cpu_used += stats['cpu_used']
+            total_mem_max += stats['mem_max']
+            total_mem_used += stats['mem_used']
+            total_disk_max += stats['disk_max']
+            total_disk_used += stats['disk_used']
     
     cpu_percent = (total_cpu_used / total_cpu_max * 100) if total_cpu_max > 0 else 0
     mem_percent = (total_mem_used / total_mem_max * 100) if total_mem_max > 0 else 0
@@ -324,15 +533,27 @@ def create_dashboard(server_data, growth_prediction):
 
 def export_to_json(server_data, growth_prediction, filename="proxmox_stats.json"):
     """Export collected data to JSON file"""
+    # Expand VMRecord tuples back into dicts so the export keeps field names
+    serializable = {
+        server: {
+            node: {**stats, 'vm_details': [vm._asdict() for vm in stats['vm_details']]}
+            for node, stats in nodes.items()
+        }
+        for server, nodes in server_data.items()
+    }
     data = {
         "timestamp": datetime.now().isoformat(),
         "growth_prediction": growth_prediction,
-        "server_data": server_data
+        "server_data": serializable
     }
     
-    with open(filename, 'w') as f:
-        json.dump(data, f, indent=2)
-    logger.info(f"Data exported to {filename}")
+    if orjson is not None:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(filename, 'w') as f:
+            json.dump(data, f, indent=2)
+    logger.info("Data exported to %s", filename)
     print(f"{Fore.GREEN}Data exported to {filename}{Style.RESET_ALL}")
 
 # Main function
@@ -347,9 +568,16 @@ def main():
                         help="Export filename (default: proxmox_stats.json)")
     parser.add_argument("-v", "--verbose", action="store_true",
                         help="Enable verbose output (debug mode)")
-    parser.add_argument("-l", "--list-vms", action="store_true", 
+    parser.add_argument("-l", "--list-vms", action="store_true",
                         help="Display detailed VM list for each server")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always re-fetch node capacity from the API")
+    parser.add_argument("--cache-ttl", type=int, default=3600,
+                        help="Node capacity cache lifetime in seconds (default: 3600)")
     args = parser.parse_args()
+
+    global node_cache_ttl
+    node_cache_ttl = 0 if args.no_cache else args.cache_ttl
     
     # Set logging level based on verbose flag
     if args.verbose:
@@ -358,7 +586,7 @@ def main():
         logger.debug("Debug mode enabled")
     
     yaml_file = args.config
-    logger.info(f"Starting Proxmox monitoring application using {yaml_file}")
+    logger.info("Starting Proxmox monitoring application using %s", yaml_file)
     
     # Display banner
     print(f"\n{Fore.CYAN}{Style.BRIGHT}{'=' * 60}")
@@ -372,29 +600,46 @@ def main():
         print(f"{Fore.RED}Error: No valid credentials loaded from {yaml_file}{Style.RESET_ALL}")
         return
     server_data = {}
-    for server, creds in servers.items():
-        logger.info(f"Processing server {server}...")
-        print(f"{Fore.BLUE}Processing server {server}...{Style.RESET_ALL}")
-        try:
-            nodes = get_server_stats(server, creds['username'], creds['password'])
-            if nodes:
-                server_data[server] = nodes
-                # Display VM list for this server if requested
-                if args.list_vms:
-                    display_vm_list(server, nodes)
-            else:
-                logger.warning(f"No data collected from server {server}")
-                print(f"{Fore.YELLOW}Warning: No data collected from server {server}{Style.RESET_ALL}")
-        except Exception as e:
-            logger.error(f"Failed to process server {server}: {e}")
-            print(f"{Fore.RED}Error: Failed to process server {server}: {e}{Style.RESET_ALL}")
+    # Cluster-wide totals, accumulated as each server's future completes:
+    # (vms_running, cpu_used, cpu_free, mem_used, mem_free, disk_used, disk_free)
+    cluster_totals = (0, 0, 0, 0, 0, 0, 0)
+    # Query all servers in parallel - the work is network-bound, so total
+    # wall time becomes roughly the slowest server instead of the sum of all
+    with ThreadPoolExecutor(max_workers=min(32, len(servers))) as executor:
+        futures = {
+            executor.submit(get_server_stats, server, creds['username'], creds['password'],
+                            include_details=args.list_vms or args.export): server
+            for server, creds in servers.items()
+        }
+        for server in servers:
+            logger.info("Processing server %s...", server)
+            print(f"{Fore.BLUE}Processing server {server}...{Style.RESET_ALL}")
+        for future in as_completed(futures):
+            server = futures[future]
+            try:
+                nodes, server_totals = future.result()
+                if nodes:
+                    server_data[server] = nodes
+                    cluster_totals = tuple(a + b for a, b in zip(cluster_totals, server_totals))
+                else:
+                    logger.warning("No data collected from server %s", server)
+                    print(f"{Fore.YELLOW}Warning: No data collected from server {server}{Style.RESET_ALL}")
+            except Exception as e:
+                logger.error("Failed to process server %s: %s", server, e)
+                print(f"{Fore.RED}Error: Failed to process server {server}: {e}{Style.RESET_ALL}")
+
+    # Display VM lists after collection so output stays ordered by server
+    if args.list_vms:
+        for server in servers:
+            if server in server_data:
+                display_vm_list(server, server_data[server])
     
     if not server_data:
         logger.error("No data collected from any server.")
         print(f"{Fore.RED}Error: No data collected from any server.{Style.RESET_ALL}")
         return
     
-    growth_prediction = predict_growth(server_data)
+    growth_prediction = predict_growth(cluster_totals)
     create_dashboard(server_data, growth_prediction)
     
     # Export data if requested